@@ -0,0 +1,86 @@
+"""
+Text and YTS record normalization helpers.
+
+Kept free of I/O and fully annotated so the module can be compiled with
+mypyc (see setup.py); scraper.py imports it the same way either way.
+"""
+
+import re
+from functools import lru_cache
+from typing import Any, Dict, Tuple
+
+
+# Top-level YTS fields holding URLs on the YTS domain
+_URL_FIELDS: Tuple[str, ...] = (
+    "url",
+    "background_image",
+    "small_cover_image",
+    "medium_cover_image",
+    "large_cover_image",
+)
+
+# Torrent fields that are volatile or unused downstream
+_TORRENT_DROP: Tuple[str, ...] = ("seeds", "peers", "date_uploaded", "date_uploaded_unix")
+
+# Whitespace clean_text has to collapse: anything but a single space
+_MESSY_WS_RE = re.compile(r"[^\S ]|  ")
+
+
+def make_relative(url: str, base_url: str) -> str:
+    """Convert an absolute URL to a relative one if it matches the base URL."""
+    # Cheap first-character check before the full prefix comparison
+    if not url or url[0] != base_url[:1] or not url.startswith(base_url):
+        return url
+    return url[len(base_url):]
+
+
+@lru_cache(maxsize=8192)
+def clean_text(text: str) -> str:
+    """Clean whitespace from text."""
+    # Already tidy text (the common case) is returned as-is without allocating
+    if not text or (text[0] != " " and text[-1] != " " and not _MESSY_WS_RE.search(text)):
+        return text
+    return " ".join(text.split())
+
+
+def clean_yts_data(data: Dict[str, Any], base_url: str) -> Dict[str, Any]:
+    """Clean YTS data and convert URLs to relative paths."""
+    # make_relative is inlined below; this runs for every field of every movie
+    base_first: str = base_url[:1]
+    base_len: int = len(base_url)
+    
+    # Convert main fields
+    for field in _URL_FIELDS:
+        url = data.get(field)
+        if url and url[0] == base_first and url.startswith(base_url):
+            data[field] = url[base_len:]
+            
+    # Convert screenshots
+    for i in range(1, 4):
+        for prefix in ("large_screenshot_image", "medium_screenshot_image"):
+            key = f"{prefix}{i}"
+            url = data.get(key)
+            if url and url[0] == base_first and url.startswith(base_url):
+                data[key] = url[base_len:]
+
+    # Convert torrents and prune seeds/peers in the same pass
+    for torrent in data.get("torrents") or ():
+        url = torrent.get("url")
+        if url and url[0] == base_first and url.startswith(base_url):
+            torrent["url"] = url[base_len:]
+        for key in _TORRENT_DROP:
+            torrent.pop(key, None)
+                
+    # Prune unnecessary fields
+    data.pop("date_uploaded", None)
+    data.pop("date_uploaded_unix", None)
+    data.pop("background_image_original", None)
+
+    data["title"] = clean_text(data.get("title", ""))
+    if data.get("description_full"):
+        data["description_full"] = clean_text(data["description_full"])
+    
+    # Remember which base URL this record was normalized against
+    data["_normalized_for"] = base_url
+        
+    return data
@@ -5,42 +5,296 @@ Kinoteka Scraper - Python version using cloudscraper to bypass Cloudflare.
 
 import os
 import sys
-import json
 import re
-import time
-from datetime import datetime, timezone
-from typing import Optional, Dict, Any
+import asyncio
+import hashlib
+import json
+import mmap
+import heapq
+import signal
+import sqlite3
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Dict, Any, List, NamedTuple, Tuple, Union
 
+import aiohttp
 import cloudscraper
-import requests
-from bs4 import BeautifulSoup
+from aiohttp_client_cache import CachedSession, SQLiteBackend
+from aiohttp_client_cache.cache_control import DO_NOT_CACHE
+from aiolimiter import AsyncLimiter
+from selectolax.lexbor import LexborHTMLParser, LexborNode as Node
+from tenacity import retry, retry_if_exception, stop_after_attempt, wait_exponential_jitter
+from urllib3.util.retry import Retry
+
+from cleaners import clean_text, clean_yts_data
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # Falls back to the stdlib json module
+
+try:
+    import uvloop
+except ImportError:
+    uvloop = None  # Falls back to the default asyncio event loop (uvloop has no Windows build)
 
 
 # Constants
 YTS_API_BASE = "https://yts.lt/api/v2"  # Will be updated dynamically
 IMDB_API_BASE = "https://api.imdbapi.dev"
+GEMINI_API_URL = "https://generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash:generateContent"
+SUBTITLE_DOWNLOAD_BASE = "https://dl.opensubtitles.org/en/download/sub/"
 OUTPUT_PATH = "fulldatabase.json"
 LATEST_PATH = "latest_movies.json"
+LATEST_COUNT = 50
+UPLOAD_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+DB_PATH = "fulldatabase.sqlite"
+EXPORT_INTERVAL = timedelta(hours=24)
+# Export early once this many entries have been written since the last snapshot
+EXPORT_CHANGE_THRESHOLD = 500
+CHECK_INTERVAL = timedelta(minutes=60)
+
+_IMDB_RE = re.compile(r"imdb\.com/title/tt(\d+)")
+_HEADING_RE = re.compile(rb"<h[12][\s>].*?</h[12]>", re.I | re.S)
+_RESULTS_TABLE_RE = re.compile(rb"<table\b[^>]*\bid=[\"']?search_results\b", re.I)
+_SE_RE = re.compile(r"\[S\d+E\d+")
+
+# Repeated string values shared between movies (see intern_values)
+_INTERNED_MOVIE_FIELDS = ("language", "mpa_rating")
+_INTERNED_TORRENT_FIELDS = ("quality", "type", "video_codec", "bit_depth", "audio_channels")
+
+# Request rate caps per remote host (requests per second, retries included).
+# A new movie costs two YTS requests (search + details) and one IMDb request.
+YTS_RATE = 3
+IMDB_RATE = 5
+GEMINI_RATE = 2
+# New movies enriched concurrently, which also caps API requests in flight
+MAX_IN_FLIGHT = 16
+# Pooled connections kept per host by the API session
+CONNECTIONS_PER_HOST = 64
+
+# Plots translated per Gemini request
+GEMINI_BATCH_SIZE = 20
+
+# Retry policy for the cloudscraper session. 403/429/503 are left alone since
+# Cloudflare answers challenges with them and cloudscraper has to see those.
+SCRAPER_RETRY = Retry(total=3, backoff_factor=0.5, status_forcelist=(500, 502, 504), raise_on_status=False)
+
+# Transient API statuses retried with backoff (or the server's Retry-After)
+RETRY_STATUSES = frozenset((429, 500, 502, 503, 504))
+API_RETRY_ATTEMPTS = 5
+# Longest wait between attempts, also for a server asking for more via Retry-After
+API_RETRY_MAX_WAIT = 30
+_API_BACKOFF = wait_exponential_jitter(initial=1, max=API_RETRY_MAX_WAIT)
+
+API_TIMEOUT = aiohttp.ClientTimeout(total=10)
+GEMINI_TIMEOUT = aiohttp.ClientTimeout(total=30)
+
+# Local caches (YTS/IMDb responses, YTS misses, Gemini translations); the YTS domain lives in the store's meta table
+CACHE_DIR = ".cache"
+API_CACHE_PATH = os.path.join(CACHE_DIR, "api_cache.sqlite")
+YTS_MISS_CACHE_PATH = os.path.join(CACHE_DIR, "yts_misses.sqlite")
+TRANSLATION_CACHE_PATH = os.path.join(CACHE_DIR, "translations.sqlite")
+API_CACHE_TTL = timedelta(days=7)
+DOMAIN_CACHE_TTL = timedelta(hours=6)
+# How long a movie YTS did not have is left alone before searching for it again
+YTS_MISS_TTL = timedelta(days=1)
+
+
+class TranslationCache:
+    """SQLite store of Gemini translations keyed by a hash of the source text."""
+
+    def __init__(self, path: str):
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("CREATE TABLE IF NOT EXISTS translations (key TEXT PRIMARY KEY, text TEXT NOT NULL)")
+
+    @staticmethod
+    def _key(text: str) -> str:
+        return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+    def get(self, text: str) -> Optional[str]:
+        row = self.conn.execute("SELECT text FROM translations WHERE key = ?", (self._key(text),)).fetchone()
+        return row[0] if row else None
+
+    def set(self, text: str, translated: str) -> None:
+        with self.conn:
+            self.conn.execute("INSERT OR REPLACE INTO translations (key, text) VALUES (?, ?)", (self._key(text), translated))
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+class YtsMissCache:
+    """SQLite record of IMDb IDs YTS had no movie for, with the time of the search."""
+
+    def __init__(self, path: str):
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("CREATE TABLE IF NOT EXISTS misses (imdb_id TEXT PRIMARY KEY, checked_at REAL NOT NULL)")
+
+    def expires_at(self, imdb_id: str) -> Optional[float]:
+        """Epoch time after which the movie should be searched for again, or None if never missed."""
+        row = self.conn.execute("SELECT checked_at FROM misses WHERE imdb_id = ?", (imdb_id,)).fetchone()
+        return row[0] + YTS_MISS_TTL.total_seconds() if row else None
+
+    def is_recent(self, imdb_id: str) -> bool:
+        expires_at = self.expires_at(imdb_id)
+        return expires_at is not None and datetime.now(timezone.utc).timestamp() < expires_at
+
+    def add(self, imdb_id: str) -> None:
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO misses (imdb_id, checked_at) VALUES (?, ?)",
+                (imdb_id, datetime.now(timezone.utc).timestamp()),
+            )
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+class MovieStore:
+    """SQLite store holding one JSON-encoded database entry per IMDb ID."""
+
+    def __init__(self, path: str):
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("CREATE TABLE IF NOT EXISTS movies (imdb_id TEXT PRIMARY KEY, entry JSON NOT NULL)")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+
+    def load(self) -> Dict[str, Any]:
+        # rowid follows first insertion, so the dict comes back in the order movies were added
+        rows = self.conn.execute("SELECT imdb_id, entry FROM movies ORDER BY rowid")
+        return {imdb_id: json_loads(entry) for imdb_id, entry in rows}
+
+    def upsert(self, items: Dict[str, Any]) -> None:
+        with self.conn:
+            self.conn.executemany(
+                # An upsert keeps the row (and its rowid); INSERT OR REPLACE would move it to the end
+                "INSERT INTO movies (imdb_id, entry) VALUES (?, ?) "
+                "ON CONFLICT(imdb_id) DO UPDATE SET entry = excluded.entry",
+                ((imdb_id, json_dumps(entry)) for imdb_id, entry in items.items()),
+            )
+
+    def get_meta(self, key: str) -> Optional[str]:
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, key: str, value: str) -> None:
+        with self.conn:
+            self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+def intern_values(results: Dict[str, Any]) -> None:
+    """
+    Intern the small set of enum-like strings repeated across YTS records.
+
+    Dict keys are left alone: orjson caches decoded keys across calls, so they are
+    already shared between entries. The stdlib json fallback only shares keys
+    within one json_loads call, so each stored entry gets its own copies there.
+    """
+    intern = sys.intern
+    for entry in results.values():
+        yts_data = entry.get("yts_data")
+        if not yts_data:
+            continue
+        for field in _INTERNED_MOVIE_FIELDS:
+            if isinstance(yts_data.get(field), str):
+                yts_data[field] = intern(yts_data[field])
+        if yts_data.get("genres"):
+            yts_data["genres"] = [intern(g) for g in yts_data["genres"]]
+        for torrent in yts_data.get("torrents") or ():
+            for field in _INTERNED_TORRENT_FIELDS:
+                if isinstance(torrent.get(field), str):
+                    torrent[field] = intern(torrent[field])
+
+
+def add_upload_timestamps(results: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Give entries saved before date_uploaded_ts existed an epoch parsed from their date string.
+
+    Returns the migrated entries so they can be written back once.
+    """
+    migrated = {}
+    for imdb_id, entry in results.items():
+        if "date_uploaded_ts" in entry:
+            continue
+        try:
+            uploaded = datetime.strptime(entry.get("date_uploaded", ""), UPLOAD_DATE_FORMAT)
+            entry["date_uploaded_ts"] = int(uploaded.replace(tzinfo=timezone.utc).timestamp())
+        except (TypeError, ValueError):
+            entry["date_uploaded_ts"] = 0
+        migrated[imdb_id] = entry
+    return migrated
+
+
+def _upload_key(entry: Dict[str, Any]) -> int:
+    return entry.get("date_uploaded_ts", 0)
+
+
+def json_loads(data: Union[bytes, str]) -> Any:
+    """Decode JSON, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps(data: Any, indent: bool = False) -> bytes:
+    """Encode JSON as UTF-8 bytes, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 if indent else 0)
+    if indent:
+        return json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def read_json(path: str) -> Any:
+    """Decode a JSON file straight from a read-only memory map of it."""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            # mmap refuses empty files
+            raise json.JSONDecodeError("Empty file", "", 0)
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if orjson is None:
+                return json.loads(mm[:])
+            with memoryview(mm) as view:
+                return orjson.loads(view)
+
+
+def _atomic_write(path: str, data: bytes) -> None:
+    """Replace path with data so readers never see a partially written file."""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+        # Make sure the bytes are on disk before the rename makes them visible
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def write_json(path: str, data: Any) -> None:
+    """Write data as indented JSON, replacing the file atomically."""
+    _atomic_write(path, json_dumps(data, indent=True))
 
 
-def get_current_yts_domain() -> str:
+def get_current_yts_domain(scraper: cloudscraper.CloudScraper) -> str:
     """Fetch the current official YTS domain from yifystatus.com."""
     try:
-        scraper = cloudscraper.create_scraper()
         resp = scraper.get("https://yifystatus.com/")
         if resp.status_code == 200:
-            soup = BeautifulSoup(resp.text, "lxml")
-            # Look for "Current official domain" text
-            target_text = soup.find(string=re.compile(r"Current official domain"))
-            if target_text:
-                # The next sibling or parent might contain the link
+            tree = LexborHTMLParser(resp.text)
+            # Look for the element holding "Current official domain" text
+            for node in tree.css("*"):
+                if "Current official domain" not in node.text(deep=False):
+                    continue
+                # The link is inside that element
                 # Structure is usually: <span>Current official domain: <a href="...">YTS.LT</a></span>
-                parent = target_text.find_parent()
-                link = parent.find("a") if parent else None
-                if link and link.get("href"):
-                    domain = link.get("href").rstrip("/")
+                link = node.css_first("a")
+                href = link.attributes.get("href") if link is not None else None
+                if href:
+                    domain = href.rstrip("/")
                     print(f"  [INFO] Detected global YTS domain: {domain}")
                     return domain
+                break
     except Exception as e:
         print(f"  [WARN] Failed to fetch YTS domain from yifystatus.com: {e}")
     
@@ -48,243 +302,391 @@ def get_current_yts_domain() -> str:
     return "https://yts.lt"
 
 
-def make_relative(url: str, base_url: str) -> str:
-    """Convert an absolute URL to a relative one if it matches the base URL."""
-    if not url:
-        return url
-    if url.startswith(base_url):
-        return url[len(base_url):]
-    return url
-
-
-def clean_yts_data(data: Dict[str, Any], base_url: str) -> Dict[str, Any]:
-    """Clean YTS data and convert URLs to relative paths."""
-    # Convert main fields
-    fields_to_relativize = [
-        "url",
-        "background_image", 
-        "small_cover_image", 
-        "medium_cover_image", 
-        "large_cover_image"
-    ]
-    
-    for field in fields_to_relativize:
-        if data.get(field):
-            data[field] = make_relative(data[field], base_url)
-            
-    # Convert screenshots
-    for i in range(1, 4):
-        key = f"large_screenshot_image{i}"
-        if data.get(key):
-            data[key] = make_relative(data[key], base_url)
-        key = f"medium_screenshot_image{i}"
-        if data.get(key):
-            data[key] = make_relative(data[key], base_url)
-
-    # Convert torrents
-    if data.get("torrents"):
-        for torrent in data["torrents"]:
-            if torrent.get("url"):
-                torrent["url"] = make_relative(torrent["url"], base_url)
-                
-    # Prune unnecessary fields
-    data.pop("date_uploaded", None)
-    data.pop("date_uploaded_unix", None)
-    data.pop("background_image_original", None)
-    
-    # Prune seeds/peers from torrents
-    if data.get("torrents"):
-        for torrent in data["torrents"]:
-            torrent.pop("seeds", None)
-            torrent.pop("peers", None)
-            torrent.pop("date_uploaded", None)
-            torrent.pop("date_uploaded_unix", None)
-
-    data["title"] = clean_text(data.get("title", ""))
-    if data.get("description_full"):
-        data["description_full"] = clean_text(data["description_full"])
-        
-    return data
+def _is_transient(exc: BaseException) -> bool:
+    return isinstance(exc, aiohttp.ClientResponseError) and exc.status in RETRY_STATUSES
 
 
-def clean_text(text: str) -> str:
-    """Clean whitespace from text."""
-    return " ".join(text.replace("\n", " ").replace("\t", " ").split())
+def _retry_wait(retry_state) -> float:
+    """Wait as long as a Retry-After header asks, else back off exponentially with jitter."""
+    exc = retry_state.outcome.exception()
+    retry_after = exc.headers.get("Retry-After") if exc.headers else None
+    if retry_after and retry_after.isdigit():
+        # Capped so a long Retry-After cannot park a task (and its in-flight slot) for ages
+        return min(float(retry_after), API_RETRY_MAX_WAIT)
+    return _API_BACKOFF(retry_state)
 
 
-def fetch_yts_movie(imdb_id: str) -> Optional[Dict[str, Any]]:
-    """Fetch movie details from YTS API."""
-    try:
-        # Step 1: Find movie ID
-        list_url = f"{YTS_API_BASE}/list_movies.json?query_term={imdb_id}"
-        resp = requests.get(list_url, timeout=10)
-        resp.raise_for_status()
-        data = resp.json()
-        
-        movies = data.get("data", {}).get("movies", [])
-        if not movies:
-            return None
-        
-        movie_id = None
-        for m in movies:
-            if m.get("imdb_code") == imdb_id:
-                movie_id = m.get("id")
-                break
-        
-        if not movie_id:
-            return None
-        
-        # Step 2: Get full details
-        details_url = f"{YTS_API_BASE}/movie_details.json?movie_id={movie_id}&with_images=true&with_cast=true"
-        resp = requests.get(details_url, timeout=10)
-        resp.raise_for_status()
-        data = resp.json()
-        
-        return data.get("data", {}).get("movie")
-    except Exception as e:
-        print(f"  [ERROR] YTS API error: {e}")
-        return None
+retry_transient = retry(
+    retry=retry_if_exception(_is_transient),
+    wait=_retry_wait,
+    stop=stop_after_attempt(API_RETRY_ATTEMPTS),
+    reraise=True,
+)
 
 
-def fetch_imdb_data(imdb_id: str) -> Optional[Dict[str, Any]]:
-    """Fetch movie data from IMDb API."""
-    try:
-        url = f"{IMDB_API_BASE}/titles/{imdb_id}"
-        print(f"  [INFO] Fetching IMDb data for {imdb_id}: {url}")
-        resp = requests.get(url, headers={"accept": "application/json"}, timeout=10)
-        resp.raise_for_status()
-        return resp.json()
-    except Exception as e:
-        print(f"  [ERROR] IMDb API error: {e}")
+@retry_transient
+async def _get_json(session: aiohttp.ClientSession, url: str, limiter: AsyncLimiter, **kwargs) -> Any:
+    """GET url and decode its JSON body, retrying transient failures."""
+    # Every attempt, retries included, takes its own slot from the host's rate limit
+    async with limiter:
+        async with session.get(url, timeout=API_TIMEOUT, **kwargs) as resp:
+            resp.raise_for_status()
+            return json_loads(await resp.read())
+
+
+async def fetch_yts_movie(imdb_id: str, session: aiohttp.ClientSession, limiter: AsyncLimiter) -> Optional[Dict[str, Any]]:
+    """
+    Fetch movie details from YTS API.
+
+    Returns None only when YTS has no such movie; request errors are raised.
+    """
+    # Step 1: Find movie ID
+    list_url = f"{YTS_API_BASE}/list_movies.json?query_term={imdb_id}"
+    data = await _get_json(session, list_url, limiter)
+    
+    movies = data.get("data", {}).get("movies", [])
+    if not movies:
         return None
+    
+    movie_id = None
+    for m in movies:
+        if m.get("imdb_code") == imdb_id:
+            movie_id = m.get("id")
+            break
+    
+    if not movie_id:
+        return None
+    
+    # Step 2: Get full details
+    details_url = f"{YTS_API_BASE}/movie_details.json?movie_id={movie_id}&with_images=true&with_cast=true"
+    data = await _get_json(session, details_url, limiter)
+    
+    return data.get("data", {}).get("movie")
+
+
+async def fetch_imdb_data(imdb_id: str, session: aiohttp.ClientSession, limiter: AsyncLimiter) -> Optional[Dict[str, Any]]:
+    """Fetch movie data from IMDb API; request errors are raised."""
+    url = f"{IMDB_API_BASE}/titles/{imdb_id}"
+    print(f"  [INFO] Fetching IMDb data for {imdb_id}: {url}")
+    return await _get_json(session, url, limiter, headers={"accept": "application/json"})
+
+
+@retry_transient
+async def _gemini_generate(
+    prompt: str,
+    api_key: str,
+    session: aiohttp.ClientSession,
+    limiter: AsyncLimiter,
+    generation_config: Optional[Dict[str, Any]] = None,
+) -> Optional[str]:
+    """Send a single prompt to Gemini and return the text of the first candidate."""
+    url = f"{GEMINI_API_URL}?key={api_key}"
+    payload: Dict[str, Any] = {
+        "contents": [{
+            "parts": [{"text": prompt}]
+        }]
+    }
+    if generation_config:
+        payload["generationConfig"] = generation_config
+    
+    # Every attempt, retries included, takes its own slot from the rate limit
+    async with limiter:
+        async with session.post(url, json=payload, headers={"Content-Type": "application/json"}, timeout=GEMINI_TIMEOUT) as resp:
+            if resp.status in RETRY_STATUSES:
+                resp.raise_for_status()
+            if not resp.ok:
+                print(f"  [ERROR] Gemini API Error: {resp.status} - {await resp.text()}")
+                return None
+            
+            data = json_loads(await resp.read())
+    
+    candidates = data.get("candidates", [])
+    if candidates:
+        content = candidates[0].get("content", {})
+        parts = content.get("parts", [])
+        if parts:
+            return parts[0].get("text", "").strip()
+    return None
 
 
-def translate_with_gemini(text: str, api_key: str) -> Optional[str]:
+async def translate_with_gemini(
+    text: str, api_key: str, session: aiohttp.ClientSession, limiter: AsyncLimiter
+) -> Optional[str]:
     """Translate text to Albanian using Gemini API."""
     if not text or not text.strip():
         return None
     
     try:
-        url = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash:generateContent?key={api_key}"
         prompt = f"Translate the following movie synopsis into Albanian. Return only the translated text.\n\n{text}"
-        
-        payload = {
-            "contents": [{
-                "parts": [{"text": prompt}]
-            }]
-        }
-        
-        resp = requests.post(url, json=payload, headers={"Content-Type": "application/json"}, timeout=30)
-        
-        if not resp.ok:
-            print(f"  [ERROR] Gemini API Error: {resp.status_code} - {resp.text}")
+        return await _gemini_generate(prompt, api_key, session, limiter)
+    except Exception as e:
+        print(f"  [ERROR] Gemini translation error: {e}")
+        return None
+
+
+async def translate_batch_with_gemini(
+    texts: List[str], api_key: str, session: aiohttp.ClientSession, limiter: AsyncLimiter
+) -> Optional[List[Optional[str]]]:
+    """
+    Translate several texts to Albanian with one Gemini request.
+
+    Returns one translation per text (None where an item came back empty), or
+    None if the reply is not a JSON array of the same length.
+    """
+    try:
+        # Numbered one-per-line items, so the text itself must not contain newlines
+        numbered = "\n".join(f"[{i}] {clean_text(text)}" for i, text in enumerate(texts, 1))
+        prompt = (
+            "Translate each numbered English movie synopsis to Albanian. "
+            "Return a JSON array of strings, same order, same length.\n\n"
+            f"{numbered}"
+        )
+        reply = await _gemini_generate(prompt, api_key, session, limiter, {"responseMimeType": "application/json"})
+        if not reply:
             return None
         
-        data = resp.json()
-        candidates = data.get("candidates", [])
-        if candidates:
-            content = candidates[0].get("content", {})
-            parts = content.get("parts", [])
-            if parts:
-                return parts[0].get("text", "").strip()
-        return None
+        items = json_loads(reply)
+        if not isinstance(items, list) or len(items) != len(texts):
+            return None
+        return [item.strip() if isinstance(item, str) and item.strip() else None for item in items]
     except Exception as e:
-        print(f"  [ERROR] Gemini translation error: {e}")
+        print(f"  [ERROR] Gemini batch translation error: {e}")
         return None
 
 
-def parse_subtitles(html: str) -> list:
-    """Parse subtitles from OpenSubtitles HTML page."""
-    soup = BeautifulSoup(html, "lxml")
-    subtitles = []
+async def translate_plots(
+    pending: List[Tuple[Dict[str, Any], str]],
+    api_key: str,
+    session: aiohttp.ClientSession,
+    translations: TranslationCache,
+    gemini_limiter: AsyncLimiter,
+) -> None:
+    """Replace English plots in (yts_data, plot) pairs with Albanian translations where possible."""
+    misses = []
+    for yts_data, plot in pending:
+        cached = translations.get(plot)
+        if cached is not None:
+            yts_data["description_full"] = clean_text(cached)
+        else:
+            misses.append((yts_data, plot))
     
-    # Check if it's a TV series page (skip those)
-    if "http://schema.org/TVSeries" in html:
+    if not misses:
+        return
+    
+    print(f"  [INFO] Translating {len(misses)} plot(s)...")
+    for start in range(0, len(misses), GEMINI_BATCH_SIZE):
+        batch = misses[start:start + GEMINI_BATCH_SIZE]
+        texts = [plot for _, plot in batch]
+        results = None
+        if len(batch) > 1:
+            results = await translate_batch_with_gemini(texts, api_key, session, gemini_limiter)
+            if results is None:
+                print("  [WARN] Unusable Gemini batch reply. Translating one by one.")
+        if results is None:
+            results = [await translate_with_gemini(text, api_key, session, gemini_limiter) for text in texts]
+        
+        for (yts_data, plot), translated in zip(batch, results):
+            if translated:
+                translations.set(plot, translated)
+                yts_data["description_full"] = clean_text(translated)
+            else:
+                print(f"  [WARN] Translation failed for {yts_data.get('imdb_code')}. Using English.")
+
+
+class SubRow(NamedTuple):
+    """A subtitle row from the search page; the download link is derived from id when stored."""
+    id: int
+    movie: str
+    filename: str
+    imdb_id: Optional[str]
+
+
+def subtitle_item(sub: SubRow) -> Dict[str, Any]:
+    """Build the subtitle record kept in a movie's subtitle_list."""
+    return {
+        "id": sub.id,
+        "filename": sub.filename,
+        "download_link": SUBTITLE_DOWNLOAD_BASE + str(sub.id),
+    }
+
+
+def _parse_row(row: Node) -> Optional[SubRow]:
+    """Extract a subtitle record from a search result row, or None to skip it."""
+    row_id_str = (row.attributes.get("id") or "name0").replace("name", "")
+    try:
+        sub_id = int(row_id_str)
+    except ValueError:
+        sub_id = 0
+    
+    # Extract IMDb ID with one regex pass over the row's markup (no per-anchor selector walk)
+    match = _IMDB_RE.search(row.html)
+    imdb_id = f"tt{match.group(1)}" if match else None
+    
+    # Get movie name and check if it's a subtitle link
+    main_link = row.css_first("a.bnone, a[href*='/subtitles/']")
+    if main_link is None:
+        return None
+    
+    href = main_link.attributes.get("href") or ""
+    name = clean_text(main_link.text())
+    
+    if "/subtitles/" not in href:
+        return None
+    
+    # Extract filename
+    filename = None
+    td = row.css_first("td[id^='main']")
+    if td is not None:
+        span = td.css_first("span[title]")
+        if span is not None:
+            filename = span.attributes.get("title")
+        if not filename:
+            texts = [t for t in (n.text(deep=False).strip() for n in td.traverse(include_text=True) if n.tag == "-text") if t]
+            if len(texts) > 1:
+                fallback = texts[1]
+                if fallback and fallback not in ("Watch online", "Download Subtitles Searcher") and "search results" not in fallback:
+                    filename = fallback
+    
+    if not filename:
+        filename = name
+    
+    # Check for TV series episode tags ("[S01E02]") in the title or filename
+    if _SE_RE.search(name) or _SE_RE.search(filename):
+        print(f"  [DEBUG] Row-level TV Series filter: {name}")
+        return None
+    
+    return SubRow(sub_id, name, filename, imdb_id)
+
+
+def parse_subtitles(html: bytes) -> List[SubRow]:
+    """Parse subtitles from the raw bytes of an OpenSubtitles HTML page."""
+    # Check if it's a TV series page (skip those) before any decoding or parsing
+    if b"schema.org/TVSeries" in html:
         print("  [DEBUG] Filtered: TV Series detected")
         return []
     
-    for h in soup.select("h1, h2"):
-        text = h.get_text()
+    # Only the headings and the results table matter, so the rest of the page is never parsed
+    for heading in _HEADING_RE.findall(html):
+        # Markup without the words cannot have them in its text; only parse the rest
+        if not (b"Season" in heading or b"Episode" in heading or b"TV Series" in heading):
+            continue
+        text = LexborHTMLParser(heading).body.text()
         if "Season" in text or "Episode" in text or "TV Series" in text:
             print("  [DEBUG] Filtered: TV Series in header")
             return []
     
-    table = soup.select_one("table#search_results")
-    if not table:
+    match = _RESULTS_TABLE_RE.search(html)
+    tree = LexborHTMLParser(html[match.start():] if match else html)
+    table = tree.css_first("table#search_results")
+    if table is None:
         print("  [DEBUG] No table#search_results found")
         return []
     
-    imdb_re = re.compile(r"tt(\d+)")
-    
-    for row in table.select("tr[id^='name']"):
-        row_id_str = row.get("id", "name0").replace("name", "")
-        try:
-            sub_id = int(row_id_str)
-        except ValueError:
-            sub_id = 0
-        
-        # Extract IMDb ID
-        imdb_id = None
-        for a in row.select("a[href*='imdb.com/title/tt']"):
-            href = a.get("href", "")
-            match = imdb_re.search(href)
-            if match:
-                imdb_id = f"tt{match.group(1)}"
-                break
-        
-        # Get movie name and check if it's a subtitle link
-        main_link = row.select_one("a.bnone, a[href*='/subtitles/']")
-        if not main_link:
-            continue
-        
-        href = main_link.get("href", "")
-        name = clean_text(main_link.get_text())
-        
-        if "/subtitles/" not in href:
-            continue
-        
-        # Check for TV series patterns in row
-        row_text = row.get_text()
-        if "[S" in row_text and "E" in row_text:
-            print(f"  [DEBUG] Row-level TV Series filter: {name}")
-            continue
-        
-        # Extract filename
-        filename = None
-        td = row.select_one("td[id^='main']")
-        if td:
-            span = td.select_one("span[title]")
-            if span:
-                filename = span.get("title")
-            if not filename:
-                texts = [t.strip() for t in td.stripped_strings]
-                if len(texts) > 1:
-                    fallback = texts[1]
-                    if fallback and fallback not in ("Watch online", "Download Subtitles Searcher") and "search results" not in fallback:
-                        filename = fallback
-        
-        if not filename:
-            filename = name
-        
-        subtitles.append({
-            "id": sub_id,
-            "movie": name,
-            "filename": filename,
-            "imdb_id": imdb_id,
-            "download_link": f"https://dl.opensubtitles.org/en/download/sub/{sub_id}",
-        })
+    subtitles = []
+    for row in table.css("tr[id^='name']"):
+        sub = _parse_row(row)
+        if sub:
+            subtitles.append(sub)
     
     return subtitles
 
 
-def main():
+async def process_new_movie(
+    imdb_id: str,
+    subs: List[SubRow],
+    session: aiohttp.ClientSession,
+    base_url: str,
+    yts_limiter: AsyncLimiter,
+    imdb_limiter: AsyncLimiter,
+    yts_misses: YtsMissCache,
+) -> Optional[Tuple[Dict[str, Any], Optional[str]]]:
+    """
+    Build a database entry for a movie not seen before, or None if YTS lacks it.
+
+    Request errors while looking the movie up on YTS are logged and re-raised.
+
+    Returns the entry together with the English IMDb plot, which is stored
+    as the description until it gets translated. The caller stamps the upload date.
+    """
+    cleaned_title = clean_text(subs[0].movie)
+    print(f"  [*] New Movie found: {cleaned_title} ({imdb_id})")
+    
+    # A movie YTS lacked a moment ago is not searched for again every cycle
+    if yts_misses.is_recent(imdb_id):
+        print(f"  [SKIP] Movie not found on YTS (checked recently): {cleaned_title} ({imdb_id})")
+        return None
+    
+    try:
+        yts_data = await fetch_yts_movie(imdb_id, session, yts_limiter)
+    except Exception as e:
+        # Not remembered as a miss: run_cycle drops the search page validators on any failure,
+        # so the next cycle fetches the page in full and looks this movie up again
+        print(f"  [ERROR] YTS API error: {e}")
+        raise
+    
+    if not yts_data:
+        yts_misses.add(imdb_id)
+        print(f"  [SKIP] Movie not found on YTS: {cleaned_title} ({imdb_id})")
+        return None
+    
+    # Clean and relativize
+    yts_data = clean_yts_data(yts_data, base_url)
+    
+    try:
+        imdb_full_data = await fetch_imdb_data(imdb_id, session, imdb_limiter)
+    except Exception as e:
+        print(f"  [ERROR] IMDb API error: {e}")
+        imdb_full_data = None
+    plot_en = imdb_full_data.get("plot") if imdb_full_data else None
+    
+    if plot_en:
+        # clean_yts_data has already marked the record normalized, so clean the plot here
+        yts_data["description_full"] = clean_text(plot_en)
+    
+    entry = {
+        "title": cleaned_title,
+        "year": yts_data.get("year"),
+        "subtitle_list": [subtitle_item(sub) for sub in subs],
+    }
+    
+    # Featured logic
+    movie_year = yts_data.get("year")
+    if movie_year in [2025, 2026] and imdb_full_data:
+        vote_count = imdb_full_data.get("rating", {}).get("voteCount")
+        if vote_count and vote_count > 7500:
+            entry["is_featured"] = True
+            print(f"  [FEATURED] Movie {cleaned_title} is featured (Votes: {vote_count})")
+            
+    entry["yts_data"] = yts_data
+    return entry, plot_en
+
+
+async def async_main():
     global YTS_API_BASE
     
     args = sys.argv[1:]
     run_once = "--once" in args
     
-    # 1. Fetch current YTS domian
-    current_yts_url = get_current_yts_domain()
+    store = MovieStore(DB_PATH)
+    
+    # One cloudscraper session for both Cloudflare-guarded sites (yifystatus and OpenSubtitles)
+    scraper = cloudscraper.create_scraper(
+        browser={
+            'browser': 'chrome',
+            'platform': 'darwin',
+            'mobile': False
+        }
+    )
+    # Keep cloudscraper's own TLS adapter (its cipher setup is part of the bypass), just add retries
+    scraper.get_adapter("https://").max_retries = SCRAPER_RETRY
+    
+    # 1. Fetch current YTS domian (reused for a few hours, it rarely moves)
+    current_yts_url = store.get_meta("yts_domain")
+    checked = store.get_meta("yts_domain_checked")
+    if not current_yts_url or not checked or datetime.now(timezone.utc) - datetime.fromisoformat(checked) >= DOMAIN_CACHE_TTL:
+        current_yts_url = await asyncio.to_thread(get_current_yts_domain, scraper)
+        store.set_meta("yts_domain", current_yts_url)
+        store.set_meta("yts_domain_checked", datetime.now(timezone.utc).isoformat())
     YTS_API_BASE = f"{current_yts_url}/api/v2"
     
     print("=== Subtitle Monitor Daemon (Python) ===")
@@ -296,164 +698,256 @@ def main():
         print("Mode: Daemon (Checking every 60 minutes...)")
     
     # Load existing data
-    results: Dict[str, Any] = {}
-    if os.path.exists(OUTPUT_PATH):
+    results: Dict[str, Any] = store.load()
+    if results:
+        print(f"Loaded existing progress from {DB_PATH}.")
+    elif os.path.exists(OUTPUT_PATH):
         print(f"Loading existing progress from {OUTPUT_PATH}...")
         try:
-            with open(OUTPUT_PATH, "r", encoding="utf-8") as f:
-                loaded_data = json.load(f)
-                # Handle old vs new format
-                if "database" in loaded_data:
-                    results = loaded_data["database"]
-                else:
-                    results = loaded_data
+            loaded_data = read_json(OUTPUT_PATH)
+            # Handle old vs new format
+            if "database" in loaded_data:
+                results = loaded_data["database"]
+            else:
+                results = loaded_data
+            store.upsert(results)
         except json.JSONDecodeError:
             print("  [WARN] Failed to decode existing database. Starting fresh.")
     
+    intern_values(results)
+    migrated = add_upload_timestamps(results)
+    if migrated:
+        store.upsert(migrated)
+    
+    # Stored subtitle IDs per movie, kept in step with results for O(1) duplicate checks
+    existing_ids: Dict[str, set] = {
+        imdb_id: {s["id"] for s in entry.get("subtitle_list", ())}
+        for imdb_id, entry in results.items()
+    }
+    # Newest entries for the latest feed; only new movies can enter it, so it is merged, not rebuilt
+    latest: List[Dict[str, Any]] = heapq.nlargest(LATEST_COUNT, results.values(), key=_upload_key)
     print(f"Loaded database with {len(results)} movies.")
     
-    # Create cloudscraper session
-    scraper = cloudscraper.create_scraper(
-        browser={
-            'browser': 'chrome',
-            'platform': 'darwin',
-            'mobile': False
-        }
+    yts_limiter = AsyncLimiter(YTS_RATE, 1)
+    imdb_limiter = AsyncLimiter(IMDB_RATE, 1)
+    gemini_limiter = AsyncLimiter(GEMINI_RATE, 1)
+    in_flight = asyncio.Semaphore(MAX_IN_FLIGHT)
+    
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    translations = TranslationCache(TRANSLATION_CACHE_PATH)
+    yts_misses = YtsMissCache(YTS_MISS_CACHE_PATH)
+    # Only detail lookups are cached; the YTS search must notice movies as soon as YTS lists them
+    api_cache = SQLiteBackend(
+        API_CACHE_PATH,
+        expire_after=DO_NOT_CACHE,
+        urls_expire_after={
+            "*/api/v2/movie_details.json": API_CACHE_TTL,
+            f"{IMDB_API_BASE}/titles/": API_CACHE_TTL,
+        },
+        allowed_codes=(200,),
     )
     
-    while True:
-        now = datetime.now()
-        print(f"\\n[{now.strftime('%Y-%m-%d %H:%M:%S')}] Checking for updates...")
-        
-        search_url = "https://www.opensubtitles.org/en/search/sublanguageid-alb/searchonlymovies-on/offset-0/sort-5/asc-0"
-        
-        try:
-            resp = scraper.get(search_url)
-            if resp.status_code != 200:
-                print(f"  [ERROR] HTTP {resp.status_code} for URL: {search_url}")
-                print(f"  [ERROR] Body Snippet: {resp.text[:500]}")
-            else:
-                subtitles = parse_subtitles(resp.text)
-                new_count = 0
+    connector = aiohttp.TCPConnector(limit_per_host=CONNECTIONS_PER_HOST)
+    async with CachedSession(cache=api_cache, connector=connector) as session:
+        async def run_cycle():
+            """Check OpenSubtitles once and store anything new."""
+            nonlocal latest
+            now = datetime.now()
+            print(f"\\n[{now.strftime('%Y-%m-%d %H:%M:%S')}] Checking for updates...")
+            
+            search_url = "https://www.opensubtitles.org/en/search/sublanguageid-alb/searchonlymovies-on/offset-0/sort-5/asc-0"
+            
+            try:
+                # Conditional GET: an unchanged page comes back as an empty 304.
+                # Skipped once a movie on the page that YTS lacked is due to be searched again.
+                headers = {}
+                recheck_at = store.get_meta("search_recheck_at")
+                if not recheck_at or datetime.now(timezone.utc).timestamp() < float(recheck_at):
+                    etag = store.get_meta("search_etag")
+                    last_modified = store.get_meta("search_last_modified")
+                    if etag:
+                        headers["If-None-Match"] = etag
+                    if last_modified:
+                        headers["If-Modified-Since"] = last_modified
                 
-                for sub in subtitles:
-                    imdb_id = sub.get("imdb_id")
-                    if not imdb_id:
-                        continue
-                    
-                    sub_item = {
-                        "id": sub["id"],
-                        "filename": sub["filename"],
-                        "download_link": sub["download_link"],
-                    }
-                    
-                    is_new_movie = False
-                    is_new_sub = False
+                resp = await asyncio.to_thread(scraper.get, search_url, headers=headers)
+                if resp.status_code == 304:
+                    print("No changes since last check.")
+                elif resp.status_code != 200:
+                    print(f"  [ERROR] HTTP {resp.status_code} for URL: {search_url}")
+                    print(f"  [ERROR] Body Snippet: {resp.text[:500]}")
+                else:
+                    subtitles = parse_subtitles(resp.content)
+                    new_count = 0
                     
-                    if imdb_id in results:
-                        existing_ids = [s["id"] for s in results[imdb_id].get("subtitle_list", [])]
-                        if sub_item["id"] not in existing_ids:
-                            results[imdb_id]["subtitle_list"].append(sub_item)
-                            is_new_sub = True
-                    else:
-                        is_new_movie = True
+                    # Subtitles for unknown movies, grouped so each movie is enriched once
+                    new_movies: Dict[str, List[SubRow]] = {}
+                    # Entries to write back to the store
+                    changed: Dict[str, Any] = {}
                     
-                    if is_new_movie:
-                        cleaned_title = clean_text(sub["movie"])
-                        print(f"  [*] New Movie found: {cleaned_title} ({imdb_id})")
+                    for sub in subtitles:
+                        imdb_id = sub.imdb_id
+                        if not imdb_id:
+                            continue
                         
-                        time.sleep(1)
-                        yts_data = fetch_yts_movie(imdb_id)
+                        entry = results.get(imdb_id)
+                        if entry is None:
+                            new_movies.setdefault(imdb_id, []).append(sub)
+                            continue
                         
-                        if yts_data:
-                            # Clean and relativize
-                            yts_data = clean_yts_data(yts_data, current_yts_url)
-                            
-                            time.sleep(0.5)
-                            imdb_full_data = fetch_imdb_data(imdb_id)
-                            plot_en = imdb_full_data.get("plot") if imdb_full_data else None
-                            
-                            if plot_en:
-                                api_key = os.environ.get("GEMINI_API_KEY")
-                                if api_key:
-                                    print("  [INFO] Translating plot...")
-                                    translated = translate_with_gemini(plot_en, api_key)
-                                    if translated:
-                                        print("  [INFO] Translation successful.")
-                                        yts_data["description_full"] = translated
-                                    else:
-                                        print("  [WARN] Translation failed. Using English.")
-                                        yts_data["description_full"] = plot_en
-                                else:
-                                    yts_data["description_full"] = plot_en
-                            
-                            entry = {
-                                "title": cleaned_title,
-                                "year": yts_data.get("year"),
-                                "subtitle_list": [sub_item],
-                                "date_uploaded": datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S"),
-                            }
-                            
-                            # Featured logic
-                            movie_year = yts_data.get("year")
-                            if movie_year in [2025, 2026] and imdb_full_data:
-                                vote_count = imdb_full_data.get("rating", {}).get("voteCount")
-                                if vote_count and vote_count > 7500:
-                                    entry["is_featured"] = True
-                                    print(f"  [FEATURED] Movie {cleaned_title} is featured (Votes: {vote_count})")
-                                    
-                            entry["yts_data"] = yts_data
-                            results[imdb_id] = entry
+                        known = existing_ids.setdefault(imdb_id, set())
+                        if sub.id not in known:
+                            known.add(sub.id)
+                            entry["subtitle_list"].append(subtitle_item(sub))
+                            changed[imdb_id] = entry
+                            print(f"  [+] New subtitle for existing movie: {imdb_id}")
                             new_count += 1
-                        else:
-                            print(f"  [SKIP] Movie not found on YTS: {cleaned_title} ({imdb_id})")
-                    elif is_new_sub:
-                        print(f"  [+] New subtitle for existing movie: {imdb_id}")
-                        new_count += 1
-                
-                if new_count > 0:
-                    print(f"Found {new_count} new items. Saving database...")
                     
-                    # Normalize all data to relative paths
-                    for mid, entry in results.items():
-                        if entry.get("yts_data"):
-                            entry["yts_data"] = clean_yts_data(entry["yts_data"], current_yts_url)
+                    async def enrich(imdb_id, subs):
+                        async with in_flight:
+                            return await process_new_movie(
+                                imdb_id, subs, session, current_yts_url, yts_limiter, imdb_limiter, yts_misses
+                            )
                     
-                    full_output = {
-                        "yts_url": current_yts_url,
-                        "database": results
-                    }
+                    processed = await asyncio.gather(
+                        *(enrich(imdb_id, subs) for imdb_id, subs in new_movies.items()),
+                        return_exceptions=True,
+                    )
+                    # Movies whose lookup failed (already logged) are retried on the next full fetch
+                    failed = {imdb_id for imdb_id, item in zip(new_movies, processed) if isinstance(item, BaseException)}
+                    processed = [None if isinstance(item, BaseException) else item for item in processed]
+                    # Earliest time a movie YTS lacked should be searched for again
+                    miss_expiries = [
+                        yts_misses.expires_at(imdb_id) for imdb_id, item in zip(new_movies, processed)
+                        if item is None and imdb_id not in failed
+                    ]
                     
-                    with open(OUTPUT_PATH, "w", encoding="utf-8") as f:
-                        json.dump(full_output, f, indent=2, ensure_ascii=False)
+                    # One batched Gemini request for every plot found this cycle
+                    api_key = os.environ.get("GEMINI_API_KEY")
+                    if api_key:
+                        pending = [(item[0]["yts_data"], item[1]) for item in processed if item and item[1]]
+                        await translate_plots(pending, api_key, session, translations, gemini_limiter)
                     
-                    # Generate latest feed
-                    print("Generating latest_movies.json...")
-                    all_movies = list(results.values())
-                    all_movies.sort(key=lambda x: x.get("date_uploaded", ""), reverse=True)
-                    latest_list = all_movies[:50]
+                    # Every movie added this cycle shares one upload time
+                    uploaded = datetime.now(timezone.utc)
+                    uploaded_str = uploaded.strftime(UPLOAD_DATE_FORMAT)
+                    uploaded_ts = int(uploaded.timestamp())
                     
-                    latest_output = {
-                        "yts_url": current_yts_url,
-                        "movies": latest_list
-                    }
+                    added: List[Dict[str, Any]] = []
+                    for (imdb_id, subs), item in zip(new_movies.items(), processed):
+                        if item:
+                            entry = item[0]
+                            entry["date_uploaded"] = uploaded_str
+                            entry["date_uploaded_ts"] = uploaded_ts
+                            results[imdb_id] = entry
+                            added.append(entry)
+                            existing_ids[imdb_id] = {s["id"] for s in entry["subtitle_list"]}
+                            changed[imdb_id] = entry
+                            new_count += len(subs)
                     
-                    with open(LATEST_PATH, "w", encoding="utf-8") as f:
-                        json.dump(latest_output, f, indent=2, ensure_ascii=False)
-                else:
-                    print("No new items found.")
-        
-        except Exception as e:
-            print(f"Error fetching updates: {e}")
-            import traceback
-            traceback.print_exc()
+                    if new_count > 0:
+                        print(f"Found {new_count} new items. Saving database...")
+                        
+                        # Normalize all data to relative paths
+                        for mid, entry in results.items():
+                            yts_data = entry.get("yts_data")
+                            if yts_data and yts_data.get("_normalized_for") != current_yts_url:
+                                entry["yts_data"] = clean_yts_data(yts_data, current_yts_url)
+                                changed[mid] = entry
+                        
+                        store.upsert(changed)
+                        store.set_meta("last_change", datetime.now(timezone.utc).isoformat())
+                        pending = int(store.get_meta("changes_since_export") or 0) + len(changed)
+                        store.set_meta("changes_since_export", str(pending))
+                        
+                        # Generate latest feed
+                        print("Generating latest_movies.json...")
+                        if added:
+                            latest = heapq.nlargest(LATEST_COUNT, latest + added, key=_upload_key)
+                        
+                        latest_output = {
+                            "yts_url": current_yts_url,
+                            "movies": latest
+                        }
+                        
+                        write_json(LATEST_PATH, latest_output)
+                    else:
+                        print("No new items found.")
+                    
+                    # Only remember the validators once the page has been fully processed;
+                    # after a failed lookup they are dropped so the next cycle fetches the page in full
+                    if failed:
+                        print(f"  [WARN] {len(failed)} movie(s) could not be looked up. Retrying next cycle.")
+                        store.set_meta("search_etag", "")
+                        store.set_meta("search_last_modified", "")
+                    else:
+                        store.set_meta("search_etag", resp.headers.get("ETag") or "")
+                        store.set_meta("search_last_modified", resp.headers.get("Last-Modified") or "")
+                    store.set_meta("search_recheck_at", str(min(miss_expiries)) if miss_expiries else "")
+                
+                # The full JSON snapshot is exported on a schedule, or early after many changes
+                # (every run in single-run mode)
+                last_change = store.get_meta("last_change")
+                last_export = store.get_meta("last_export")
+                if last_change and (not last_export or last_change > last_export):
+                    now_utc = datetime.now(timezone.utc)
+                    if (
+                        run_once
+                        or not last_export
+                        or int(store.get_meta("changes_since_export") or 0) >= EXPORT_CHANGE_THRESHOLD
+                        or now_utc - datetime.fromisoformat(last_export) >= EXPORT_INTERVAL
+                    ):
+                        print(f"Exporting {OUTPUT_PATH}...")
+                        full_output = {
+                            "yts_url": current_yts_url,
+                            "database": results
+                        }
+                        write_json(OUTPUT_PATH, full_output)
+                        store.set_meta("last_export", now_utc.isoformat())
+                        store.set_meta("changes_since_export", "0")
+            
+            except Exception as e:
+                print(f"Error fetching updates: {e}")
+                import traceback
+                traceback.print_exc()
+            
+            # Hit rate of the title cleaning memo, to judge whether its size fits the workload
+            info = clean_text.cache_info()
+            if info.hits or info.misses:
+                print(f"  [DEBUG] clean_text cache: {info.hits / (info.hits + info.misses):.0%} hits, {info.currsize}/{info.maxsize} entries")
         
         if run_once:
+            await run_cycle()
             print("Single run complete. Exiting.")
-            break
-        
-        print("Sleeping for 60 minutes...")
-        time.sleep(60 * 60)
+        else:
+            # SIGINT/SIGTERM end the wait between cycles instead of killing a cycle midway
+            stop = asyncio.Event()
+            loop = asyncio.get_running_loop()
+            for sig in (signal.SIGINT, signal.SIGTERM):
+                try:
+                    loop.add_signal_handler(sig, stop.set)
+                except NotImplementedError:
+                    pass  # Not supported on Windows
+            
+            while not stop.is_set():
+                await run_cycle()
+                print("Sleeping for 60 minutes...")
+                try:
+                    await asyncio.wait_for(stop.wait(), timeout=CHECK_INTERVAL.total_seconds())
+                except asyncio.TimeoutError:
+                    pass
+            print("Shutdown requested. Exiting.")
+    
+    translations.close()
+    yts_misses.close()
+    store.close()
+
+
+def main():
+    if uvloop is not None:
+        uvloop.run(async_main())
+    else:
+        asyncio.run(async_main())
 
 
 if __name__ == "__main__":
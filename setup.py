@@ -0,0 +1,20 @@
+"""
+Optional native build of the cleaners module with mypyc.
+
+    pip install mypy
+    python setup.py build_ext --inplace
+
+scraper.py picks up the compiled extension automatically when it is
+present next to cleaners.py, and falls back to the pure Python module
+otherwise.
+"""
+
+from setuptools import setup
+from mypyc.build import mypycify
+
+
+setup(
+    name="kinoteka-scraper",
+    py_modules=["cleaners", "scraper"],
+    ext_modules=mypycify(["cleaners.py"]),
+)